@@ -0,0 +1,242 @@
+import numpy as np
+
+# Adaptive Runge-Kutta (Dormand-Prince 5(4)) integration of many initial-value
+# problems at once. The whole (n_traj, dim) state advances in lockstep, but each
+# trajectory has its own time and step size; finished (or failed) trajectories
+# are dropped from the active set, and all stage work reuses preallocated buffers.
+
+# Butcher tableau
+C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1])
+A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+    [35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84],
+]
+# Error weights: 5th-order minus embedded 4th-order solution (stage 7 is the FSAL stage)
+E = np.array([71 / 57600, 0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40])
+# Dense output: y(t + theta*h) = y + h * sum_i k_i * sum_j P[i, j] theta^(j+1)
+P = np.array([
+    [1, -8048581381 / 2820520608, 8663915743 / 2820520608, -12715105075 / 11282082432],
+    [0, 0, 0, 0],
+    [0, 131558114200 / 32700410799, -68118460800 / 10900136933, 87487479700 / 32700410799],
+    [0, -1754552775 / 470086768, 14199869525 / 1410260304, -10690763975 / 1880347072],
+    [0, 127303824393 / 49829197408, -318862633887 / 49829197408, 701980252875 / 199316789632],
+    [0, -282668133 / 205662961, 2019193451 / 616988883, -1453857185 / 822651844],
+    [0, 40617522 / 29380423, -110615467 / 29380423, 69997945 / 29380423],
+])
+
+class EnsembleResult:
+    """
+    t, y: final time (n_traj,) and state (n_traj, dim) of every trajectory.
+    success: trajectories that reached t_end. n_steps / n_rejected: per-trajectory counts.
+    n_fev: number of (batched) calls to f.
+    t_eval, y_eval: requested output times and the dense-output states (n_traj, len(t_eval), dim).
+    Rows where success is False stop early and hold NaN for the t_eval points they never reached.
+    """
+    def __init__(self, t, y, success, n_steps, n_rejected, n_fev, t_eval=None, y_eval=None):
+        self.t = t
+        self.y = y
+        self.success = success
+        self.n_steps = n_steps
+        self.n_rejected = n_rejected
+        self.n_fev = n_fev
+        self.t_eval = t_eval
+        self.y_eval = y_eval
+
+def _rms_norm(x):
+    return np.sqrt(np.mean(np.square(x), axis=1))
+
+def _initial_step(f, t0, y0, f0, rtol, atol):
+    # Hairer, Norsett & Wanner's starting step heuristic, per trajectory
+    scale = atol + rtol * np.abs(y0)
+    d0 = _rms_norm(y0 / scale)
+    d1 = _rms_norm(f0 / scale)
+    h0 = np.where((d0 < 1e-5) | (d1 < 1e-5), 1e-6, 0.01 * d0 / np.maximum(d1, 1e-300))
+    y1 = y0 + h0[:, None] * f0
+    f1 = np.empty_like(y0)
+    f(t0 + h0, y1, f1)
+    d2 = _rms_norm((f1 - f0) / scale) / h0
+    d_max = np.maximum(d1, d2)
+    h1 = np.where(d_max <= 1e-15, np.maximum(1e-6, h0 * 1e-3), (0.01 / np.maximum(d_max, 1e-300)) ** (1 / 5))
+    return np.minimum(100 * h0, h1)
+
+def solve_ivp_ensemble(f, t_span, y0, rtol=1e-6, atol=1e-9, t_eval=None, first_step=None,
+                       max_steps=100000, inplace=False, indexed=False):
+    """
+    Integrate dy/dt = f(t, y) from t_span[0] to t_span[1] for every row of y0.
+
+    f is called with the times (m,) and states (m, dim) of the m active
+    trajectories and returns dy/dt with shape (m, dim); with inplace=True it is
+    called as f(t, y, out) and writes into out instead (no allocation per stage).
+    With indexed=True the row indices of the active trajectories in y0 are passed
+    as well, f(t, y, index[, out]), so per-trajectory parameters can be looked up.
+    t_eval: optional increasing output times inside t_span, filled from the
+    Dormand-Prince continuous extension, so step sizes are not constrained by it.
+    Check result.success: trajectories that hit max_steps or a vanishing step size
+    keep their last state in y and NaN in the unreached part of y_eval.
+    """
+    t0, t_end = map(float, t_span)
+    if t_end <= t0:
+        raise ValueError("t_span must be increasing.")
+    y = np.array(y0, dtype=float, ndmin=2)
+    n, dim = y.shape
+
+    t = np.full(n, t0)
+    n_steps = np.zeros(n, dtype=np.int64)
+    n_rejected = np.zeros(n, dtype=np.int64)
+    success = np.zeros(n, dtype=bool)
+
+    # Stage buffers, sized once for the full ensemble; m active rows use [:m] views
+    K = np.empty((7, n, dim))
+    y_stage = np.empty((n, dim))
+    y_new = np.empty((n, dim))
+    tmp = np.empty((n, dim))
+    err_tmp = np.empty((n, dim))
+    fsal = np.empty((n, dim)) # k1 of each trajectory's next step
+
+    def call_f(t_args, y_args, index, out):
+        extra = (index,) if indexed else ()
+        if inplace:
+            f(t_args, y_args, *extra, out)
+        else:
+            out[...] = f(t_args, y_args, *extra)
+
+    call_f(t, y, np.arange(n), fsal)
+    n_fev = 1
+    if first_step is None:
+        h = _initial_step(lambda t_args, y_args, out: call_f(t_args, y_args, np.arange(n), out),
+                          t, y, fsal, rtol, atol)
+        n_fev += 1
+    else:
+        h = np.full(n, float(first_step))
+
+    if t_eval is not None:
+        t_eval = np.asarray(t_eval, dtype=float)
+        if len(t_eval) and (t_eval[0] < t0 or t_eval[-1] > t_end or np.any(np.diff(t_eval) < 0)):
+            raise ValueError("t_eval must be increasing and lie inside t_span.")
+        # NaN marks output times a failed trajectory never reached
+        y_eval = np.full((n, len(t_eval), dim), np.nan)
+        # Output points at t0 are exact initial values
+        next_eval = np.searchsorted(t_eval, t0, side="right")
+        y_eval[:, :next_eval] = y[:, None, :]
+        next_eval = np.full(n, next_eval)
+    else:
+        y_eval = None
+
+    active = np.arange(n)
+    while len(active):
+        m = len(active)
+        t_a = t[active]
+        h_a = np.minimum(h[active], t_end - t_a)
+        y_a = np.take(y, active, axis=0, out=y_stage[:m])
+        k = K[:, :m]
+        np.take(fsal, active, axis=0, out=k[0])
+
+        # Stages 2..7
+        for i in range(1, 7):
+            ys = y_new[:m]
+            np.multiply(k[0], A[i][0], out=ys)
+            for j in range(1, i):
+                if A[i][j]:
+                    np.multiply(k[j], A[i][j], out=tmp[:m])
+                    ys += tmp[:m]
+            ys *= h_a[:, None]
+            ys += y_a
+            call_f(t_a + C[i] * h_a, ys, active, k[i])
+        n_fev += 6
+        # After stage 7, y_new[:m] holds the 5th-order solution (A[6] equals the B weights)
+
+        # Error estimate, scaled per component
+        err = tmp[:m]
+        np.multiply(k[0], E[0], out=err)
+        for j in range(2, 7):
+            np.multiply(k[j], E[j], out=err_tmp[:m])
+            err += err_tmp[:m]
+        err *= h_a[:, None]
+        scale = atol + rtol * np.maximum(np.abs(y_a), np.abs(y_new[:m]))
+        err_norm = _rms_norm(err / scale)
+
+        accepted = err_norm <= 1
+        with np.errstate(divide="ignore"):
+            factor = np.clip(0.9 * err_norm ** -0.2, 0.2, 10.0)
+        factor[~accepted] = np.minimum(factor[~accepted], 1.0)
+        h[active] = h_a * factor
+
+        acc = active[accepted]
+        n_rejected[active[~accepted]] += 1
+        n_steps[acc] += 1
+        t_old = t_a[accepted]
+        t[acc] = t_old + h_a[accepted]
+        y[acc] = y_new[:m][accepted]
+        fsal[acc] = k[6][accepted]
+
+        if y_eval is not None and len(acc):
+            # Dense output for every requested time passed during this step
+            h_acc = h_a[accepted]
+            Q = np.einsum("ij,imd->mdj", P, k[:, accepted]) # (n_acc, dim, 4)
+            y_start = y_a[accepted]
+            ptr = next_eval[acc]
+            while True:
+                pending = (ptr < len(t_eval))
+                pending[pending] = t_eval[ptr[pending]] <= t[acc][pending] + 1e-12 * abs(t_end)
+                if not pending.any():
+                    break
+                rows = np.flatnonzero(pending)
+                theta = (t_eval[ptr[rows]] - t_old[rows]) / h_acc[rows]
+                powers = np.cumprod(np.repeat(theta[:, None], 4, axis=1), axis=1)
+                values = y_start[rows] + h_acc[rows, None] * np.einsum("mdj,mj->md", Q[rows], powers)
+                y_eval[acc[rows], ptr[rows]] = values
+                ptr[rows] += 1
+            next_eval[acc] = ptr
+
+        # Drop finished trajectories, and ones that ran out of steps or step size
+        finished = t[active] >= t_end - 1e-12 * max(1.0, abs(t_end))
+        success[active[finished]] = True
+        t[active[finished]] = t_end
+        stuck = (n_steps[active] + n_rejected[active] >= max_steps) | (h[active] < 1e-14 * np.maximum(1.0, np.abs(t[active])))
+        active = active[~finished & ~stuck]
+
+    return EnsembleResult(t, y, success, n_steps, n_rejected, n_fev, t_eval, y_eval)
+
+if __name__ == "__main__":
+    import time
+    from solve_ode import solve_ode_general
+
+    # Accuracy check against the closed form: y'' + 2y' + 5y = 0 as a first-order system
+    print("--- RK45 Ensemble vs Closed-Form Solution ---")
+    def damped(t, state, out):
+        np.copyto(out[:, 0], state[:, 1])
+        np.multiply(state[:, 0], -5, out=out[:, 1])
+        out[:, 1] -= 2 * state[:, 1]
+
+    rng = np.random.default_rng(0)
+    initial = rng.normal(size=(10000, 2))
+    grid = np.linspace(0, 5, 11)
+    start = time.perf_counter()
+    result = solve_ivp_ensemble(damped, (0, 5), initial, rtol=1e-8, atol=1e-10, t_eval=grid, inplace=True)
+    elapsed = time.perf_counter() - start
+
+    _, solution = solve_ode_general([1, 2, 5], structured=True)
+    max_error = 0.0
+    for i in range(0, len(initial), 1000):
+        solution.fit_initial_conditions(initial[i])
+        max_error = max(max_error, np.max(np.abs(result.y_eval[i, :, 0] - solution.evaluate(grid))))
+    print(f"{len(initial)} trajectories in {elapsed:.3f}s, "
+          f"{result.n_steps.mean():.1f} steps each, max dense-output error {max_error:.2e}")
+
+    # Non-linear ensemble: Van der Pol oscillators with different damping
+    print("\n--- Van der Pol Ensemble ---")
+    mu = np.linspace(0.5, 5, 2000)
+    def van_der_pol(t, state, index):
+        x, v = state[:, 0], state[:, 1]
+        return np.column_stack([v, mu[index] * (1 - x ** 2) * v - x])
+    initial = np.column_stack([np.full_like(mu, 2.0), np.zeros_like(mu)])
+    start = time.perf_counter()
+    result = solve_ivp_ensemble(van_der_pol, (0, 20), initial, rtol=1e-6, atol=1e-8, indexed=True)
+    elapsed = time.perf_counter() - start
+    print(f"{len(mu)} trajectories in {elapsed:.3f}s, steps per trajectory: "
+          f"{result.n_steps.min()}-{result.n_steps.max()}, all succeeded: {result.success.all()}")
@@ -1,70 +1,139 @@
+import math
 import numpy as np
 from collections import Counter
 
-def solve_ode_general(coefficients):
+class ODESolution:
+    """
+    Structured general solution y(x) = sum_i C_i f_i(x).
+    roots: list of (root, multiplicity), one entry per distinct real root or conjugate pair (beta > 0).
+    basis: list of (m, alpha, beta, kind) meaning x^m e^(alpha x) times 1, cos(beta x) or sin(beta x)
+    for kind "exp", "cos", "sin", in the same order as C_1, C_2, ... in the text form.
+    """
+    def __init__(self, roots, basis):
+        self.roots = roots
+        self.basis = basis
+        self.constants = None
+        # Group basis functions sharing x^m e^(lambda x): cos/sin pairs are Re/Im of one complex exponential
+        self._modes = []
+        for i, (m, alpha, beta, kind) in enumerate(basis):
+            if kind == "sin":
+                continue
+            parts = [(i, "real")] if kind == "exp" else [(i, "real"), (i + 1, "imag")]
+            self._modes.append((complex(alpha, beta), m, parts))
+
+    @property
+    def order(self):
+        return len(self.basis)
+
+    def _derivative_coefficients(self, lam, m, k):
+        # d^k/dx^k [x^m e^(lam x)] = e^(lam x) sum_j C(k, j) m!/(m-j)! lam^(k-j) x^(m-j)
+        return [(m - j, math.comb(k, j) * math.perm(m, j) * lam ** (k - j)) for j in range(min(k, m) + 1)]
+
+    def basis_matrix(self, x, derivative=0):
+        """Values of every basis function (or its k-th derivative) at x, shape x.shape + (order,)."""
+        x = np.asarray(x, dtype=float)
+        values = np.empty(x.shape + (self.order,))
+        for lam, m, parts in self._modes:
+            total = np.zeros(x.shape, dtype=complex if lam.imag else float)
+            for power, coeff in self._derivative_coefficients(lam, m, derivative):
+                total += (coeff if lam.imag else coeff.real) * x ** power
+            total *= np.exp(lam * x if lam.imag else lam.real * x)
+            for i, part in parts:
+                values[..., i] = total.real if part == "real" else total.imag
+        return values
+
+    def fit_initial_conditions(self, initial_values, x0=0.0):
+        """
+        Solve for C_i from y(x0), y'(x0), ..., y^(n-1)(x0) with one linear solve of
+        the Wronskian-style matrix W[k, i] = f_i^(k)(x0). Returns the constants.
+        """
+        initial_values = np.asarray(initial_values, dtype=float)
+        if len(initial_values) != self.order:
+            raise ValueError(f"Expected {self.order} initial values, got {len(initial_values)}.")
+        W = np.array([self.basis_matrix(x0, k) for k in range(self.order)])
+        self.constants = np.linalg.solve(W, initial_values)
+        return self.constants
+
+    def evaluate(self, x, derivative=0, constants=None, chunk_size=1 << 16):
+        """Vectorized y^(derivative)(x) over an array of points, processed in chunks to bound memory."""
+        constants = self.constants if constants is None else np.asarray(constants, dtype=float)
+        if constants is None:
+            raise ValueError("No constants: call fit_initial_conditions or pass constants.")
+        x = np.asarray(x, dtype=float)
+        flat = x.ravel()
+        out = np.empty(flat.shape)
+        for start in range(0, len(flat), chunk_size):
+            chunk = flat[start:start + chunk_size]
+            out[start:start + chunk_size] = self.basis_matrix(chunk, derivative) @ constants
+        return out.reshape(x.shape)
+
+    __call__ = evaluate
+
+def cluster_roots(roots, tolerance=1e-4):
+    """
+    Group nearly equal roots in O(n log n). Conjugates are folded together by
+    clustering the points (Re r, |Im r|): sort by real part and split where
+    consecutive gaps exceed the tolerance, then do the same on the imaginary
+    parts inside each group. np.roots scatters an m-fold root around its true
+    value, so each cluster is refined to the mean of its members.
+    Returns (centers with Im >= 0, member counts).
+    """
+    roots = np.asarray(roots, dtype=complex)
+    if len(roots) == 0:
+        return np.empty(0, dtype=complex), np.empty(0, dtype=int)
+    re, im = roots.real, np.abs(roots.imag)
+
+    order = np.argsort(re, kind="stable")
+    real_group = np.empty(len(roots), dtype=np.intp)
+    real_group[order] = np.concatenate([[0], np.cumsum(np.diff(re[order]) > tolerance)])
+
+    order = np.lexsort((im, real_group))
+    new_cluster = np.concatenate([[False], (np.diff(real_group[order]) != 0)
+                                  | (np.diff(im[order]) > tolerance)])
+    labels = np.empty(len(roots), dtype=np.intp)
+    labels[order] = np.cumsum(new_cluster)
+
+    counts = np.bincount(labels)
+    centers = (np.bincount(labels, weights=re) + 1j * np.bincount(labels, weights=im)) / counts
+    return centers, counts
+
+def solve_ode_general(coefficients, structured=False, tolerance=1e-4):
+    """
+    General solution of the ODE whose characteristic polynomial has the given
+    coefficients (highest order first). Returns the text form, or
+    (text, ODESolution) when structured=True.
+    """
     # Find roots of characteristic equation
     roots = np.roots(coefficients)
     
     # Numerical cleaning and grouping
     # High-order repeated roots are numerically unstable in np.roots
     # We will use a tolerance to group roots that are nearly identical
-    tolerance = 1e-4
-    
+    centers, counts = cluster_roots(roots, tolerance)
+
     unique_real = [] # List of [value, count]
     unique_complex = [] # List of [(alpha, beta), count] (beta positive)
-
-    processed_indices = set()
-    
-    for i in range(len(roots)):
-        if i in processed_indices: continue
-        
-        r1 = roots[i]
-        alpha1 = np.real(r1)
-        beta1 = np.imag(r1)
-        
-        # Group identical/near-identical roots
-        group = [i]
-        for j in range(i + 1, len(roots)):
-            if j in processed_indices: continue
-            if np.isclose(r1, roots[j], atol=tolerance):
-                group.append(j)
-        
-        processed_indices.update(group)
-        mult = len(group)
-        
-        if abs(beta1) < tolerance:
-            # Real root
-            unique_real.append([alpha1, mult])
+    for center, mult in zip(centers, counts):
+        if center.imag < tolerance:
+            unique_real.append([float(center.real), int(mult)])
         else:
-            # Complex root
-            # Find if its conjugate was already added or subtract half if we treat them in pairs
-            # Actually, np.roots returns both alpha+ib and alpha-ib.
-            # We want to group (alpha, |beta|) and count how many pairs we have.
-            # Since we iterate through ALL roots, we'll find both +i*beta and -i*beta.
-            # Let's count them all and divide by 2 for pairs.
-            beta_abs = abs(beta1)
-            
-            found_pair = False
-            for k in range(len(unique_complex)):
-                c_alpha, c_beta = unique_complex[k][0]
-                if np.isclose(alpha1, c_alpha, atol=tolerance) and np.isclose(beta_abs, c_beta, atol=tolerance):
-                    unique_complex[k][1] += mult
-                    found_pair = True
-                    break
-            
-            if not found_pair:
-                unique_complex.append([(alpha1, beta_abs), mult])
+            # count covers both alpha + i*beta and alpha - i*beta; halved into pairs below
+            unique_complex.append([(float(center.real), float(center.imag)), int(mult)])
 
     # Construct terms
     terms = []
+    basis = []
+    root_list = []
     c_idx = 1
     
     # 1. Real Roots
     for r, mult in sorted(unique_real, key=lambda x: x[0], reverse=True):
+        root_list.append((r, mult))
         for m in range(mult):
             x_term = f"x^{m}" if m > 1 else ("x" if m == 1 else "")
             exp_val = f"{round(r, 4)}"
             terms.append(f"C_{c_idx}{x_term}e^({exp_val}x)")
+            basis.append((m, r, 0.0, "exp"))
             c_idx += 1
             
     # 2. Complex Roots
@@ -72,6 +141,7 @@ def solve_ode_general(coefficients):
         # total_mult is sum of counts of +i*beta and -i*beta roots.
         # For a standard pair with multiplicity m, total_mult should be 2m.
         pair_mult = int(round(total_mult / 2))
+        root_list.append((complex(alpha, beta), pair_mult))
         for m in range(pair_mult):
             x_term = f"x^{m}" if m > 1 else ("x" if m == 1 else "")
             prefix = ""
@@ -83,8 +153,13 @@ def solve_ode_general(coefficients):
             c_idx += 1
             terms.append(f"C_{c_idx}{x_term}{prefix}sin({b_str}x)")
             c_idx += 1
+            basis.append((m, alpha, beta, "cos"))
+            basis.append((m, alpha, beta, "sin"))
             
-    return "y(x) = " + " + ".join(terms)
+    text = "y(x) = " + " + ".join(terms)
+    if structured:
+        return text, ODESolution(root_list, basis)
+    return text
 
 
 if __name__ == "__main__":
@@ -117,3 +192,12 @@ if __name__ == "__main__":
     coeffs5 = [1, -6, 12, -8] # (r-2)^3 = 0
     print(f"Equations coefficients: {coeffs5}")
     print(solve_ode_general(coeffs5))
+
+    # Example 6: Initial-value problem evaluated on a large grid
+    print("\n--- Initial Value Problem Example ---")
+    text, solution = solve_ode_general(coeffs4, structured=True) # (D^2 + 1)^2 y = 0
+    solution.fit_initial_conditions([1, 0, 0, 0]) # y(0) = 1, all other derivatives 0
+    x = np.linspace(0, 10, 10 ** 6)
+    y = solution.evaluate(x)
+    print(f"Constants: {np.round(solution.constants, 4)}")
+    print(f"y(10) = {y[-1]:.6f} (exact: {np.cos(10) + 5 * np.sin(10):.6f})")
@@ -1,17 +1,134 @@
+import os
+import struct
+import tempfile
+import zlib
 import numpy as np
 
 # A simple 2-layer Neural Network implementation from scratch
 # This demonstrates the math of feedforward and backpropagation
 
+# Checkpoint file layout: a 64-byte little-endian header followed by W1, W2, b1, b2
+# as raw C-order arrays, each starting on a 64-byte boundary so the file can be
+# mapped with np.memmap and its pages shared read-only between processes.
+CHECKPOINT_MAGIC = b"SNNCKPT\0"
+CHECKPOINT_VERSION = 2
+CHECKPOINT_ALIGNMENT = 64
+# magic, version, dtype, input/hidden/output sizes, learning rate, payload bytes, CRC32
+_CHECKPOINT_HEADER = struct.Struct("<8sH8s3IdQI14x")
+# The CRC32 covers the header bytes in front of it and then the payload
+_CHECKPOINT_CRC_OFFSET = struct.calcsize("<8sH8s3IdQ")
+
+def _checkpoint_crc(header, payload):
+    return zlib.crc32(payload, zlib.crc32(header[:_CHECKPOINT_CRC_OFFSET]))
+
+def _checkpoint_layout(sizes, dtype):
+    """Byte offset (from the start of the payload) and shape of W1, W2, b1, b2."""
+    input_size, hidden_size, output_size = sizes
+    shapes = [(input_size, hidden_size), (hidden_size, output_size), (1, hidden_size), (1, output_size)]
+    layout, offset = [], 0
+    for shape in shapes:
+        layout.append((offset, shape))
+        nbytes = shape[0] * shape[1] * dtype.itemsize
+        offset += -(-nbytes // CHECKPOINT_ALIGNMENT) * CHECKPOINT_ALIGNMENT
+    return layout, offset
+
+def _open_checkpoint(path):
+    """Read and check the header; return it with its fields, dtype, layout and the mapped payload."""
+    with open(path, "rb") as f:
+        header = f.read(_CHECKPOINT_HEADER.size)
+    if len(header) < _CHECKPOINT_HEADER.size:
+        raise ValueError(f"{path} is too short to be a checkpoint.")
+    fields = _CHECKPOINT_HEADER.unpack(header)
+    magic, version, dtype_str, input_size, hidden_size, output_size, _, payload_size, _ = fields
+    if magic != CHECKPOINT_MAGIC:
+        raise ValueError(f"{path} is not a SimpleNeuralNetwork checkpoint.")
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {version} (expected {CHECKPOINT_VERSION}).")
+
+    dtype = np.dtype(dtype_str.rstrip(b"\0").decode())
+    layout, expected_size = _checkpoint_layout((input_size, hidden_size, output_size), dtype)
+    if payload_size != expected_size:
+        raise ValueError("Checkpoint header does not match its layout.")
+    if os.path.getsize(path) < _CHECKPOINT_HEADER.size + payload_size:
+        raise ValueError(f"{path} is truncated.")
+    payload = np.memmap(path, dtype=np.uint8, mode="r", offset=_CHECKPOINT_HEADER.size,
+                        shape=(payload_size,))
+    return header, fields, dtype, layout, payload
+
+def verify_checkpoint(path):
+    """
+    Check the CRC32 of a checkpoint (header fields and weights). This reads the
+    whole file, so run it once where the file is written or deployed rather than
+    on every load. Raises ValueError if the file is damaged.
+    """
+    header, fields, _, _, payload = _open_checkpoint(path)
+    if _checkpoint_crc(header, payload) != fields[-1]:
+        raise ValueError(f"Checksum mismatch in {path}.")
+
 class SimpleNeuralNetwork:
-    def __init__(self, input_size, hidden_size, output_size, learning_rate=0.1):
+    def __init__(self, input_size, hidden_size, output_size, learning_rate=0.1, dtype=np.float64):
         # Initialize weights with random values
-        self.W1 = np.random.randn(input_size, hidden_size)
-        self.W2 = np.random.randn(hidden_size, output_size)
+        self.W1 = np.random.randn(input_size, hidden_size).astype(dtype)
+        self.W2 = np.random.randn(hidden_size, output_size).astype(dtype)
         # Initialize biases to zero
-        self.b1 = np.zeros((1, hidden_size))
-        self.b2 = np.zeros((1, output_size))
+        self.b1 = np.zeros((1, hidden_size), dtype=dtype)
+        self.b2 = np.zeros((1, output_size), dtype=dtype)
         self.learning_rate = learning_rate
+        self.dtype = np.dtype(dtype)
+
+    def save(self, path):
+        """
+        Write the weights to a versioned, checksummed, 64-byte aligned checkpoint
+        file. The file is replaced atomically, so existing mappings stay valid.
+        """
+        sizes = (self.W1.shape[0], self.W1.shape[1], self.W2.shape[1])
+        layout, payload_size = _checkpoint_layout(sizes, self.dtype)
+        payload = bytearray(payload_size)
+        for (offset, shape), param in zip(layout, (self.W1, self.W2, self.b1, self.b2)):
+            data = np.ascontiguousarray(param, dtype=self.dtype.newbyteorder("<")).tobytes()
+            payload[offset:offset + len(data)] = data
+        fields = (CHECKPOINT_MAGIC, CHECKPOINT_VERSION, self.dtype.newbyteorder("<").str.encode(), *sizes,
+                  self.learning_rate, payload_size)
+        header = _CHECKPOINT_HEADER.pack(*fields, 0)
+        header = _CHECKPOINT_HEADER.pack(*fields, _checkpoint_crc(header, payload))
+        # Write a temporary file next to path and rename it over path, so processes
+        # that have the old checkpoint mapped keep the old inode instead of seeing
+        # it rewritten (or truncated, which turns their page reads into SIGBUS)
+        directory, name = os.path.split(os.path.abspath(path))
+        tmp_path = os.path.join(directory, f".{name}.{os.urandom(6).hex()}.tmp")
+        # Created with mode 0o666 so the kernel applies the umask, like open(path, "wb")
+        fd = os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path, mmap=True, verify=False):
+        """
+        Restore a network saved with save(). Only the 64-byte header is read: with
+        mmap=True the weights are read-only np.memmap views, so loading is O(1) in
+        the model size and processes that load the same file share its pages; use
+        mmap=False to get writable copies for further training. verify=True also
+        runs verify_checkpoint(path), which reads the whole file.
+        """
+        header, fields, dtype, layout, payload = _open_checkpoint(path)
+        if verify and _checkpoint_crc(header, payload) != fields[-1]:
+            raise ValueError(f"Checksum mismatch in {path}.")
+
+        nn = cls.__new__(cls)
+        for name, (offset, shape) in zip(("W1", "W2", "b1", "b2"), layout):
+            param = payload[offset:offset + shape[0] * shape[1] * dtype.itemsize].view(dtype).reshape(shape)
+            setattr(nn, name, param if mmap else param.astype(dtype.newbyteorder("="), copy=True))
+        nn.learning_rate = fields[6]
+        nn.dtype = dtype.newbyteorder("=")
+        return nn
 
     def sigmoid(self, x):
         return 1 / (1 + np.exp(-x))
@@ -19,6 +136,23 @@ class SimpleNeuralNetwork:
     def sigmoid_derivative(self, x):
         return x * (1 - x)
 
+    @staticmethod
+    def stable_sigmoid(z, out, work, mask):
+        """
+        Overflow-free sigmoid written into out (which may be z), using e = exp(-|z|):
+        1 / (1 + e) for z >= 0 and e / (1 + e) for z < 0.
+        work (float) and mask (bool) are scratch buffers with z's shape.
+        """
+        np.greater_equal(z, 0, out=mask)
+        np.abs(z, out=work)
+        np.negative(work, out=work)
+        np.exp(work, out=work)
+        np.add(work, 1, out=out)
+        np.divide(1, out, out=out, where=mask)
+        np.logical_not(mask, out=mask)
+        np.divide(work, out, out=out, where=mask)
+        return out
+
     def forward(self, X):
         # Layer 1
         self.z1 = np.dot(X, self.W1) + self.b1
@@ -51,6 +185,155 @@ class SimpleNeuralNetwork:
                 loss = np.mean(np.square(y - output))
                 print(f"Epoch {i}, Loss: {loss:.6f}")
 
+    def predict(self, X, out=None, chunk_size=4096):
+        """
+        Inference without caching activations on the instance, so several threads
+        can share one model. X is processed in chunks of chunk_size rows into out
+        (allocated if not given; a supplied out must be a C-contiguous array of
+        shape (len(X), output_size) and the model's dtype); all scratch space is
+        local to the call.
+        """
+        n = len(X)
+        hidden_size, output_size = self.W2.shape
+        if out is None:
+            out = np.empty((n, output_size), dtype=self.dtype)
+        elif out.shape != (n, output_size) or out.dtype != self.dtype or not out.flags.c_contiguous:
+            raise ValueError(f"out must be a C-contiguous {self.dtype} array of shape {(n, output_size)}, "
+                             f"got {out.dtype} {out.shape}"
+                             f"{'' if out.flags.c_contiguous else ' (not C-contiguous)'}.")
+        rows = min(chunk_size, n)
+        hidden = np.empty((rows, hidden_size), dtype=self.dtype)
+        hidden_work = np.empty_like(hidden)
+        hidden_mask = np.empty(hidden.shape, dtype=bool)
+        output_work = np.empty((rows, output_size), dtype=self.dtype)
+        output_mask = np.empty(output_work.shape, dtype=bool)
+        for start in range(0, n, chunk_size):
+            stop = min(start + chunk_size, n)
+            m = stop - start
+            X_chunk = np.asarray(X[start:stop], dtype=self.dtype)
+            # z1 -> a1 in place
+            np.dot(X_chunk, self.W1, out=hidden[:m])
+            hidden[:m] += self.b1
+            self.stable_sigmoid(hidden[:m], hidden[:m], hidden_work[:m], hidden_mask[:m])
+            # z2 -> a2 directly in the caller's output rows
+            a2 = out[start:stop]
+            np.dot(hidden[:m], self.W2, out=a2)
+            a2 += self.b2
+            self.stable_sigmoid(a2, a2, output_work[:m], output_mask[:m])
+        return out
+
+    # Mini-batch training with work buffers allocated once per fit call
+    def _allocate_buffers(self, batch_size):
+        input_size, hidden_size = self.W1.shape
+        output_size = self.W2.shape[1]
+        shapes = {
+            "X": (batch_size, input_size), "y": (batch_size, output_size),
+            "a1": (batch_size, hidden_size), "a2": (batch_size, output_size),
+            "hidden_delta": (batch_size, hidden_size), "hidden_tmp": (batch_size, hidden_size),
+            "output_delta": (batch_size, output_size), "output_tmp": (batch_size, output_size),
+            "dW1": self.W1.shape, "dW2": self.W2.shape, "db1": self.b1.shape, "db2": self.b2.shape,
+        }
+        buffers = {name: np.empty(shape, dtype=self.dtype) for name, shape in shapes.items()}
+        # Sign masks for stable_sigmoid
+        buffers["hidden_mask"] = np.empty((batch_size, hidden_size), dtype=bool)
+        buffers["output_mask"] = np.empty((batch_size, output_size), dtype=bool)
+        return buffers
+
+    def _compute_gradients(self, buffers, n):
+        """
+        Forward and backward pass on the first n rows of buffers["X"] / buffers["y"],
+        writing the weight steps (same sign convention as backward) into
+        buffers["dW1"], ["dW2"], ["db1"], ["db2"]. Returns the summed squared error.
+        """
+        X, y = buffers["X"][:n], buffers["y"][:n]
+        a1, a2 = buffers["a1"][:n], buffers["a2"][:n]
+        hidden_delta, hidden_tmp = buffers["hidden_delta"][:n], buffers["hidden_tmp"][:n]
+        output_delta, output_tmp = buffers["output_delta"][:n], buffers["output_tmp"][:n]
+
+        # Forward pass (z1/z2 are computed in the activation buffers; the tmp
+        # buffers are free until the backward pass and serve as sigmoid scratch)
+        np.dot(X, self.W1, out=a1)
+        a1 += self.b1
+        self.stable_sigmoid(a1, a1, hidden_tmp, buffers["hidden_mask"][:n])
+        np.dot(a1, self.W2, out=a2)
+        a2 += self.b2
+        self.stable_sigmoid(a2, a2, output_tmp, buffers["output_mask"][:n])
+
+        # Output layer: (y - a2) * a2 * (1 - a2)
+        np.subtract(y, a2, out=output_delta)
+        squared_error = float(np.vdot(output_delta, output_delta))
+        output_delta *= a2
+        np.subtract(1, a2, out=output_tmp)
+        output_delta *= output_tmp
+
+        # Hidden layer: (output_delta . W2^T) * a1 * (1 - a1)
+        np.dot(output_delta, self.W2.T, out=hidden_delta)
+        hidden_delta *= a1
+        np.subtract(1, a1, out=hidden_tmp)
+        hidden_delta *= hidden_tmp
+
+        np.dot(a1.T, output_delta, out=buffers["dW2"])
+        np.dot(X.T, hidden_delta, out=buffers["dW1"])
+        np.sum(output_delta, axis=0, keepdims=True, out=buffers["db2"])
+        np.sum(hidden_delta, axis=0, keepdims=True, out=buffers["db1"])
+        return squared_error
+
+    def _apply_gradients(self, buffers):
+        for param, grad in ((self.W1, "dW1"), (self.W2, "dW2"), (self.b1, "db1"), (self.b2, "db2")):
+            buffers[grad] *= self.learning_rate
+            param += buffers[grad]
+
+    def fit(self, data, y=None, batch_size=256, epochs=1, shuffle=True, seed=None, log_every=1):
+        """
+        Mini-batch gradient descent.
+        data: either an (n, input_size) array (np.ndarray or np.memmap, so it can be
+        larger than RAM) with targets y, or, with y=None, an iterable of
+        (X_batch, y_batch) pairs, or a callable returning a fresh one per epoch.
+        A one-shot iterator such as a generator is consumed by the first epoch, so
+        epochs > 1 needs a callable or a re-iterable source (e.g. a list).
+        Returns the mean squared error of every epoch.
+        """
+        if y is None and epochs > 1 and not callable(data) and iter(data) is data:
+            raise ValueError("A one-shot iterator can only feed one epoch; pass a callable "
+                             "returning a fresh batch iterator for epochs > 1.")
+        rng = np.random.default_rng(seed)
+        buffers = None
+        history = []
+        for epoch in range(epochs):
+            if y is not None:
+                batches = self._iterate_minibatches(data, y, batch_size, shuffle, rng)
+            else:
+                batches = data() if callable(data) else data
+
+            squared_error, n_seen = 0.0, 0
+            for X_batch, y_batch in batches:
+                n = len(X_batch)
+                if buffers is None or n > len(buffers["X"]):
+                    buffers = self._allocate_buffers(max(n, batch_size))
+                # Copy (and cast) the batch into the work buffers; memmap pages are read here
+                np.copyto(buffers["X"][:n], X_batch, casting="unsafe")
+                np.copyto(buffers["y"][:n], np.reshape(y_batch, (n, -1)), casting="unsafe")
+                squared_error += self._compute_gradients(buffers, n)
+                self._apply_gradients(buffers)
+                n_seen += n
+
+            if n_seen == 0:
+                raise ValueError(f"Epoch {epoch} received no batches.")
+            loss = squared_error / (n_seen * self.W2.shape[1])
+            history.append(loss)
+            if log_every and epoch % log_every == 0:
+                print(f"Epoch {epoch}, Loss: {loss:.6f}")
+        return history
+
+    @staticmethod
+    def _iterate_minibatches(X, y, batch_size, shuffle, rng):
+        n = len(X)
+        order = rng.permutation(n) if shuffle else np.arange(n)
+        for start in range(0, n, batch_size):
+            # Sorted indices keep reads from a memory-mapped array monotonic
+            idx = np.sort(order[start:start + batch_size]) if shuffle else slice(start, start + batch_size)
+            yield X[idx], y[idx]
+
 if __name__ == "__main__":
     # Test on XOR problem
     X = np.array([[0,0], [0,1], [1,0], [1,1]])
@@ -64,3 +347,25 @@ if __name__ == "__main__":
     predictions = nn.forward(X)
     for i in range(len(X)):
         print(f"Input: {X[i]}, Predicted: {predictions[i][0]:.4f}, Target: {y[i][0]}")
+
+    # Save and memory-map the trained weights
+    checkpoint = os.path.join(tempfile.gettempdir(), "xor_network.ckpt")
+    nn.save(checkpoint)
+    verify_checkpoint(checkpoint)
+    restored = SimpleNeuralNetwork.load(checkpoint)
+    print(f"\nCheckpoint round trip ({os.path.getsize(checkpoint)} bytes): "
+          f"{np.array_equal(restored.predict(X), nn.predict(X))}")
+
+    # Mini-batch training in float32 on a larger noisy XOR dataset
+    rng = np.random.default_rng(0)
+    X_big = rng.integers(0, 2, size=(100000, 2)).astype(np.float32)
+    y_big = np.logical_xor(X_big[:, 0], X_big[:, 1]).astype(np.float32)[:, None]
+    X_big += rng.normal(scale=0.05, size=X_big.shape).astype(np.float32)
+
+    nn_fit = SimpleNeuralNetwork(input_size=2, hidden_size=4, output_size=1, learning_rate=0.05,
+                                 dtype=np.float32)
+    print("\nMini-batch training (float32, batch_size=32)...")
+    nn_fit.fit(X_big, y_big, batch_size=32, epochs=5, seed=0)
+    predictions = nn_fit.predict(X)
+    for i in range(len(X)):
+        print(f"Input: {X[i]}, Predicted: {predictions[i][0]:.4f}, Target: {y[i][0]}")
@@ -0,0 +1,186 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+try:
+    from .neural_network import SimpleNeuralNetwork # imported as part of the cm package
+except ImportError:
+    from neural_network import SimpleNeuralNetwork # run as a script
+
+# Data-parallel training for SimpleNeuralNetwork.
+# Weights, training data, the epoch's sample order and one gradient slot per
+# worker live in shared memory. Each step the batch is split into shards, every
+# worker writes the gradients of its shard into its slot, the main process sums
+# the slots and applies a single update. Because backward sums (not averages)
+# over the batch, the result matches fit() up to floating-point summation order.
+
+PARAM_NAMES = ("W1", "W2", "b1", "b2")
+
+def _param_views(flat, shapes):
+    views, offset = [], 0
+    for shape in shapes:
+        size = int(np.prod(shape))
+        views.append(flat[offset:offset + size].reshape(shape))
+        offset += size
+    return views
+
+class _SharedArrays:
+    """Named arrays backed by one shared memory block each."""
+    def __init__(self, specs, dtype, names=None):
+        self.blocks = {}
+        self.arrays = {}
+        for key, shape in specs.items():
+            nbytes = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+            if names is None:
+                block = shared_memory.SharedMemory(create=True, size=nbytes)
+            else:
+                block = shared_memory.SharedMemory(name=names[key])
+            self.blocks[key] = block
+            self.arrays[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+    @property
+    def names(self):
+        return {key: block.name for key, block in self.blocks.items()}
+
+    def close(self, unlink=False):
+        self.arrays.clear()
+        for block in self.blocks.values():
+            block.close()
+            if unlink:
+                block.unlink()
+
+# Per-process worker state, set up once by the pool initializer
+_worker = {}
+
+def _init_worker(names, float_specs, index_spec, dtype, sizes, learning_rate):
+    shared = _SharedArrays(float_specs, dtype, names)
+    order = _SharedArrays(index_spec, np.int64, names)
+    input_size, hidden_size, output_size = sizes
+    nn = SimpleNeuralNetwork(input_size, hidden_size, output_size, learning_rate, dtype)
+    shapes = [getattr(nn, name).shape for name in PARAM_NAMES]
+    # Point the model at the shared weights instead of its own random ones
+    for name, view in zip(PARAM_NAMES, _param_views(shared.arrays["params"], shapes)):
+        setattr(nn, name, view)
+    _worker.update(nn=nn, shared=shared, order=order, shapes=shapes, buffers=None)
+
+def _shard_gradients(args):
+    slot, start, stop = args
+    nn, shapes = _worker["nn"], _worker["shapes"]
+    X, y = _worker["shared"].arrays["X"], _worker["shared"].arrays["y"]
+    idx = _worker["order"].arrays["order"][start:stop]
+    n = len(idx)
+    if _worker["buffers"] is None or n > len(_worker["buffers"]["X"]):
+        _worker["buffers"] = nn._allocate_buffers(n)
+    buffers = _worker["buffers"]
+    np.take(X, idx, axis=0, out=buffers["X"][:n])
+    np.take(y, idx, axis=0, out=buffers["y"][:n])
+    squared_error = nn._compute_gradients(buffers, n)
+    grads = _param_views(_worker["shared"].arrays["grads"][slot], shapes)
+    for grad, name in zip(grads, ("dW1", "dW2", "db1", "db2")):
+        grad[...] = buffers[name]
+    return squared_error
+
+def fit_data_parallel(nn, X, y, n_workers=None, batch_size=1024, epochs=1, shuffle=True, seed=None,
+                      log_every=1):
+    """
+    Data-parallel counterpart of nn.fit(X, y, ...): same batching and shuffling,
+    with every batch split across n_workers processes. X and y are copied into
+    shared memory once, so they must fit in RAM. Returns the per-epoch MSE history.
+    """
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n = len(X)
+    y = np.reshape(y, (n, -1))
+    shapes = [getattr(nn, name).shape for name in PARAM_NAMES]
+    n_params = sum(int(np.prod(shape)) for shape in shapes)
+    float_specs = {"params": (n_params,), "grads": (n_workers, n_params), "X": X.shape, "y": y.shape}
+    index_spec = {"order": (n,)}
+
+    shared = _SharedArrays(float_specs, nn.dtype)
+    order = _SharedArrays(index_spec, np.int64)
+    try:
+        shared.arrays["X"][...] = X
+        shared.arrays["y"][...] = y
+        params = _param_views(shared.arrays["params"], shapes)
+        for name, view in zip(PARAM_NAMES, params):
+            view[...] = getattr(nn, name)
+        grads = shared.arrays["grads"]
+        total_grad = np.empty(n_params, dtype=nn.dtype)
+        total_views = _param_views(total_grad, shapes)
+
+        sizes = (nn.W1.shape[0], nn.W1.shape[1], nn.W2.shape[1])
+        initargs = ({**shared.names, **order.names}, float_specs, index_spec, nn.dtype, sizes,
+                    nn.learning_rate)
+        rng = np.random.default_rng(seed)
+        history = []
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                 initargs=initargs) as pool:
+            for epoch in range(epochs):
+                sample_order = order.arrays["order"]
+                sample_order[...] = rng.permutation(n) if shuffle else np.arange(n)
+                squared_error = 0.0
+                for start in range(0, n, batch_size):
+                    stop = min(start + batch_size, n)
+                    if shuffle:
+                        # Same sorted batches as fit() draws from its permutation
+                        sample_order[start:stop].sort()
+                    bounds = np.linspace(start, stop, n_workers + 1).astype(int)
+                    tasks = [(slot, lo, hi) for slot, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:]))
+                             if hi > lo]
+                    squared_error += sum(pool.map(_shard_gradients, tasks))
+
+                    # Reduce the worker slots and apply one update to the shared weights
+                    np.sum(grads[[slot for slot, _, _ in tasks]], axis=0, out=total_grad)
+                    total_grad *= nn.learning_rate
+                    for view, step in zip(params, total_views):
+                        view += step
+
+                loss = squared_error / max(n * y.shape[1], 1)
+                history.append(loss)
+                if log_every and epoch % log_every == 0:
+                    print(f"Epoch {epoch}, Loss: {loss:.6f}")
+
+        for name, view in zip(PARAM_NAMES, params):
+            getattr(nn, name)[...] = view
+        return history
+    finally:
+        shared.close(unlink=True)
+        order.close(unlink=True)
+
+def benchmark_scaling(max_workers=None, n_samples=200000, input_size=64, hidden_size=128, output_size=8,
+                      batch_size=8192, epochs=2, dtype=np.float32, seed=0):
+    """Time fit_data_parallel from 1 to max_workers processes against the single-process fit()."""
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_samples, input_size)).astype(dtype)
+    y = rng.random((n_samples, output_size)).astype(dtype)
+
+    def fresh_model():
+        np.random.seed(seed)
+        return SimpleNeuralNetwork(input_size, hidden_size, output_size, learning_rate=1e-4, dtype=dtype)
+
+    reference = fresh_model()
+    start = time.perf_counter()
+    reference.fit(X, y, batch_size=batch_size, epochs=epochs, seed=seed, log_every=0)
+    baseline = time.perf_counter() - start
+    print(f"fit (single process): {baseline:.3f}s")
+
+    results = []
+    for n_workers in range(1, max_workers + 1):
+        nn = fresh_model()
+        start = time.perf_counter()
+        fit_data_parallel(nn, X, y, n_workers=n_workers, batch_size=batch_size, epochs=epochs, seed=seed,
+                          log_every=0)
+        elapsed = time.perf_counter() - start
+        max_diff = max(float(np.max(np.abs(getattr(nn, name) - getattr(reference, name))))
+                       for name in PARAM_NAMES)
+        results.append((n_workers, elapsed))
+        print(f"{n_workers} worker(s): {elapsed:.3f}s, speedup vs fit {baseline / elapsed:.2f}x, "
+              f"max weight difference {max_diff:.2e}")
+    return baseline, results
+
+if __name__ == "__main__":
+    print("--- Data-Parallel Training Scaling Benchmark ---\n")
+    benchmark_scaling()
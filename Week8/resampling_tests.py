@@ -0,0 +1,207 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# Resampling-based tests: permutation p-values and bootstrap confidence intervals.
+# Resamples are drawn in batches as NumPy index (or sign) matrices; every batch
+# gets its own child of one SeedSequence, so results depend only on `seed` and
+# `batch_size`, never on the number of worker processes.
+# Batches run in-process by default; n_workers > 1 (or None for every core)
+# spreads them over a process pool, which requires a custom `statistic` to be
+# picklable, i.e. a module-level function rather than a lambda or closure.
+
+def mean_difference(a, b):
+    """Row-wise difference of means for (batch, n) resample matrices."""
+    return a.mean(axis=-1) - b.mean(axis=-1)
+
+def _count_extreme(stats, observed, alternative):
+    if alternative == "two-sided":
+        return int(np.count_nonzero(np.abs(stats) >= abs(observed) - 1e-12))
+    if alternative == "greater":
+        return int(np.count_nonzero(stats >= observed - 1e-12))
+    if alternative == "less":
+        return int(np.count_nonzero(stats <= observed + 1e-12))
+    raise ValueError("alternative must be 'two-sided', 'greater' or 'less'.")
+
+# Batch workers (module level so they can be pickled for the process pool)
+def _permutation_batch(args):
+    pooled, n1, size, seed_seq, statistic, observed, alternative = args
+    rng = np.random.default_rng(seed_seq)
+    idx = rng.permuted(np.broadcast_to(np.arange(len(pooled)), (size, len(pooled))), axis=1)
+    resampled = pooled[idx]
+    stats = statistic(resampled[:, :n1], resampled[:, n1:])
+    return _count_extreme(stats, observed, alternative)
+
+def _sign_flip_batch(args):
+    differences, size, seed_seq, observed, alternative = args
+    rng = np.random.default_rng(seed_seq)
+    signs = rng.integers(0, 2, size=(size, len(differences)), dtype=np.int8) * 2 - 1
+    stats = (signs * differences).mean(axis=1)
+    return _count_extreme(stats, observed, alternative)
+
+def _bootstrap_batch(args):
+    group1, group2, size, seed_seq, statistic = args
+    rng = np.random.default_rng(seed_seq)
+    idx1 = rng.integers(0, len(group1), size=(size, len(group1)))
+    if group2 is None:
+        return statistic(group1[idx1])
+    idx2 = rng.integers(0, len(group2), size=(size, len(group2)))
+    return statistic(group1[idx1], group2[idx2])
+
+def _batches(n_resamples, batch_size, seed):
+    sizes = [batch_size] * (n_resamples // batch_size)
+    if n_resamples % batch_size:
+        sizes.append(n_resamples % batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    return list(zip(sizes, seeds))
+
+def _run_batches(worker, jobs, n_workers):
+    """
+    Yield batch results in submission order: in-process for n_workers=1, from a
+    process pool otherwise (n_workers=None uses every core).
+    """
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    if n_workers <= 1 or len(jobs) == 1:
+        for job in jobs:
+            yield worker(job)
+        return
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = [pool.submit(worker, job) for job in jobs]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            # Reached on early stop as well: drop batches that have not started
+            for future in futures:
+                future.cancel()
+
+def _accumulate_p_value(results, n_total, progress, early_stop):
+    count, n_done = 0, 0
+    for n_extreme, size in results:
+        count += n_extreme
+        n_done += size
+        p_value = (count + 1) / (n_done + 1)
+        if progress is not None:
+            progress(n_done, n_total, p_value)
+        if early_stop is not None and n_done < n_total and early_stop(count, n_done):
+            break
+    return (count + 1) / (n_done + 1), n_done
+
+def stop_when_decided(alpha=0.05, z=3.29):
+    """
+    Early-stopping rule: stop once the normal confidence interval of the
+    Monte Carlo p-value (z=3.29 ~ 99.9%) lies entirely below or above alpha.
+    """
+    def rule(count, n_done):
+        p = (count + 1) / (n_done + 1)
+        half_width = z * math.sqrt(p * (1 - p) / n_done)
+        return p + half_width < alpha or p - half_width > alpha
+    return rule
+
+# 1. Independent Two-Sample Permutation Test
+def permutation_test_independent(group1, group2, statistic=mean_difference, n_resamples=10000,
+                                 alternative="two-sided", batch_size=2000, n_workers=1,
+                                 seed=None, progress=None, early_stop=None):
+    """
+    Shuffle group labels and compare statistic(group1, group2) to its permutation
+    distribution. Returns (observed, p_value, n_resamples_used).
+    With n_workers != 1, statistic must be a picklable module-level function.
+    """
+    group1 = np.asarray(group1, dtype=float)
+    group2 = np.asarray(group2, dtype=float)
+    pooled = np.concatenate([group1, group2])
+    n1 = len(group1)
+    observed = float(statistic(group1, group2))
+
+    batches = _batches(n_resamples, batch_size, seed)
+    jobs = [(pooled, n1, size, ss, statistic, observed, alternative) for size, ss in batches]
+    results = zip(_run_batches(_permutation_batch, jobs, n_workers), (size for size, _ in batches))
+    p_value, n_done = _accumulate_p_value(results, n_resamples, progress, early_stop)
+    return observed, p_value, n_done
+
+# 2. Paired Permutation Test (random sign flips of the differences)
+def permutation_test_paired(before, after, n_resamples=10000, alternative="two-sided",
+                            batch_size=2000, n_workers=1, seed=None, progress=None,
+                            early_stop=None):
+    """
+    Under H0 each difference (after - before) is equally likely to have either
+    sign. Returns (observed mean difference, p_value, n_resamples_used).
+    """
+    differences = np.asarray(after, dtype=float) - np.asarray(before, dtype=float)
+    observed = float(differences.mean())
+
+    batches = _batches(n_resamples, batch_size, seed)
+    jobs = [(differences, size, ss, observed, alternative) for size, ss in batches]
+    results = zip(_run_batches(_sign_flip_batch, jobs, n_workers), (size for size, _ in batches))
+    p_value, n_done = _accumulate_p_value(results, n_resamples, progress, early_stop)
+    return observed, p_value, n_done
+
+def _row_mean(x):
+    return x.mean(axis=-1)
+
+def _percentile_interval(group1, group2, statistic, n_resamples, confidence, batch_size,
+                         n_workers, seed, progress):
+    batches = _batches(n_resamples, batch_size, seed)
+    jobs = [(group1, group2, size, ss, statistic) for size, ss in batches]
+    stats = np.empty(n_resamples)
+    n_done = 0
+    for batch_stats in _run_batches(_bootstrap_batch, jobs, n_workers):
+        stats[n_done:n_done + len(batch_stats)] = batch_stats
+        n_done += len(batch_stats)
+        if progress is not None:
+            progress(n_done, n_resamples, None)
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(stats, [tail, 100 - tail])
+    return float(low), float(high)
+
+# 3. Independent Two-Sample Bootstrap
+def bootstrap_ci_independent(group1, group2, statistic=mean_difference, n_resamples=10000,
+                             confidence=0.95, batch_size=2000, n_workers=1, seed=None,
+                             progress=None):
+    """
+    Resample each group with replacement. Returns (observed, (low, high)) with a
+    percentile confidence interval for statistic(group1, group2).
+    With n_workers != 1, statistic must be a picklable module-level function.
+    """
+    group1 = np.asarray(group1, dtype=float)
+    group2 = np.asarray(group2, dtype=float)
+    observed = float(statistic(group1, group2))
+    interval = _percentile_interval(group1, group2, statistic, n_resamples, confidence,
+                                    batch_size, n_workers, seed, progress)
+    return observed, interval
+
+# 4. Paired Bootstrap (resample the pairs, i.e. the differences)
+def bootstrap_ci_paired(before, after, n_resamples=10000, confidence=0.95, batch_size=2000,
+                        n_workers=1, seed=None, progress=None):
+    """
+    Resample the differences (after - before) with replacement. Returns
+    (observed mean difference, (low, high)).
+    """
+    differences = np.asarray(after, dtype=float) - np.asarray(before, dtype=float)
+    observed = float(differences.mean())
+    interval = _percentile_interval(differences, None, _row_mean, n_resamples, confidence,
+                                    batch_size, n_workers, seed, progress)
+    return observed, interval
+
+if __name__ == "__main__":
+    print("--- Resampling Tests Demonstration ---\n")
+
+    g1 = [85, 90, 88, 92, 89]
+    g2 = [75, 80, 78, 82, 79]
+    before = [80, 85, 78, 92, 88]
+    after = [82, 88, 80, 95, 90]
+
+    obs, p, used = permutation_test_independent(g1, g2, n_resamples=100000, seed=0,
+                                                early_stop=stop_when_decided(alpha=0.05))
+    print(f"Independent Permutation Test: diff = {obs:.4f}, p = {p:.5f} ({used} resamples)")
+
+    obs, p, used = permutation_test_paired(before, after, n_resamples=100000, seed=0)
+    print(f"Paired Permutation Test: diff = {obs:.4f}, p = {p:.5f} ({used} resamples)")
+
+    obs, (low, high) = bootstrap_ci_independent(g1, g2, n_resamples=100000, seed=0)
+    print(f"Independent Bootstrap: diff = {obs:.4f}, 95% CI = [{low:.4f}, {high:.4f}]")
+
+    obs, (low, high) = bootstrap_ci_paired(before, after, n_resamples=100000, seed=0)
+    print(f"Paired Bootstrap: diff = {obs:.4f}, 95% CI = [{low:.4f}, {high:.4f}]")
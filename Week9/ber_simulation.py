@@ -0,0 +1,113 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+try:
+    from .hamming_code import HammingCode # imported as part of the cm package
+except ImportError:
+    from hamming_code import HammingCode # run as a script
+
+# Monte Carlo bit-error-rate (BER) and block-error-rate (BLER) simulation of
+# Hamming codes over a binary symmetric channel (BSC) with crossover probability p.
+# Every (p, job) pair draws from its own child of one SeedSequence, so results
+# depend only on `seed`, `frames_per_job` and `batch_size`, not on the pool size.
+
+_codes = {}
+
+def _get_code(r, extended):
+    # One code (and its lookup tables) per worker process
+    if (r, extended) not in _codes:
+        _codes[(r, extended)] = HammingCode(r, extended)
+    return _codes[(r, extended)]
+
+def wilson_interval(successes, trials, z=1.96):
+    """Wilson score confidence interval for a binomial proportion."""
+    if trials == 0:
+        return 0.0, 1.0
+    p_hat = successes / trials
+    denom = 1 + z ** 2 / trials
+    centre = (p_hat + z ** 2 / (2 * trials)) / denom
+    half = z * math.sqrt(p_hat * (1 - p_hat) / trials + z ** 2 / (4 * trials ** 2)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+def _simulate_job(args):
+    r, extended, p, n_frames, batch_size, seed_seq = args
+    code = _get_code(r, extended)
+    rng = np.random.default_rng(seed_seq)
+    bit_errors = block_errors = 0
+    for start in range(0, n_frames, batch_size):
+        size = min(batch_size, n_frames - start)
+        data = rng.integers(0, 2, size=(size, code.k), dtype=np.uint8)
+        received = code.encode(data)
+        received ^= rng.random((size, code.n), dtype=np.float32) < p
+        decoded, _ = code.decode(received)
+        wrong = decoded != data
+        bit_errors += int(np.count_nonzero(wrong))
+        block_errors += int(np.count_nonzero(wrong.any(axis=1)))
+    return bit_errors, block_errors
+
+def simulate_ber(crossover_probs, n_frames=10 ** 6, r=3, extended=False, frames_per_job=2 * 10 ** 5,
+                 batch_size=1 << 15, n_workers=None, seed=None, z=1.96):
+    """
+    Simulate the code over a BSC for every crossover probability.
+    Returns one dict per probability with error counts, BER/BLER and their
+    Wilson confidence intervals, plus the overall frames per second.
+    """
+    code = _get_code(r, extended)
+    crossover_probs = list(crossover_probs)
+    point_seeds = np.random.SeedSequence(seed).spawn(len(crossover_probs))
+
+    # Split every sweep point into jobs of frames_per_job frames
+    jobs, owners = [], []
+    for i, (p, point_seed) in enumerate(zip(crossover_probs, point_seeds)):
+        sizes = [frames_per_job] * (n_frames // frames_per_job)
+        if n_frames % frames_per_job:
+            sizes.append(n_frames % frames_per_job)
+        for size, job_seed in zip(sizes, point_seed.spawn(len(sizes))):
+            jobs.append((r, extended, p, size, batch_size, job_seed))
+            owners.append(i)
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    start = time.perf_counter()
+    if n_workers <= 1 or len(jobs) == 1:
+        results = [_simulate_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            results = list(pool.map(_simulate_job, jobs))
+    elapsed = time.perf_counter() - start
+
+    totals = np.zeros((len(crossover_probs), 2), dtype=np.int64)
+    for owner, counts in zip(owners, results):
+        totals[owner] += counts
+
+    report = []
+    for p, (bit_errors, block_errors) in zip(crossover_probs, totals):
+        n_bits = n_frames * code.k
+        report.append({
+            "p": p,
+            "frames": n_frames,
+            "bit_errors": int(bit_errors),
+            "block_errors": int(block_errors),
+            "ber": bit_errors / n_bits,
+            "ber_ci": wilson_interval(int(bit_errors), n_bits, z),
+            "bler": block_errors / n_frames,
+            "bler_ci": wilson_interval(int(block_errors), n_frames, z),
+        })
+    frames_per_second = n_frames * len(crossover_probs) / elapsed
+    return report, frames_per_second
+
+def theoretical_bler(p, n):
+    """Block error rate of a single-error-correcting code: P(2 or more flips in n bits)."""
+    return 1 - (1 - p) ** n - n * p * (1 - p) ** (n - 1)
+
+if __name__ == "__main__":
+    probs = [0.001, 0.005, 0.01, 0.05]
+    print("--- Hamming (7,4) over a Binary Symmetric Channel ---\n")
+    report, fps = simulate_ber(probs, n_frames=10 ** 6, seed=0)
+    for point in report:
+        low, high = point["bler_ci"]
+        print(f"p = {point['p']:<6} BER = {point['ber']:.3e}  BLER = {point['bler']:.3e} "
+              f"[{low:.3e}, {high:.3e}]  theory = {theoretical_bler(point['p'], 7):.3e}")
+    print(f"\nThroughput: {fps:,.0f} frames/s")
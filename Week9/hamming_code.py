@@ -20,6 +20,29 @@ class Hamming74:
             [0, 0, 0, 1, 1, 1, 1]
         ])
 
+        # Lookup tables for the byte-stream codec (codeword bit 1 is the MSB)
+        weights = 1 << np.arange(6, -1, -1)
+        nibble_bits = (np.arange(16)[:, None] >> np.arange(3, -1, -1)) & 1
+        # 16-entry table: data nibble -> 7-bit codeword
+        self.encode_table = ((nibble_bits @ self.G.T) % 2 @ weights).astype(np.uint8)
+        # 128-entry tables: received codeword -> corrected data nibble / error flag
+        received_bits = (np.arange(128)[:, None] >> np.arange(6, -1, -1)) & 1
+        syndrome = (received_bits @ self.H.T) % 2 @ np.array([1, 2, 4])
+        corrected = received_bits.copy()
+        has_error = syndrome > 0
+        corrected[has_error, syndrome[has_error] - 1] ^= 1
+        self.decode_table = (corrected[:, [2, 4, 5, 6]] @ weights[3:]).astype(np.uint8)
+        self.error_table = has_error.astype(np.uint8)
+
+        # Byte-level tables built from the ones above: one byte <-> two codewords (14 bits)
+        byte_values = np.arange(256)
+        self.byte_encode_table = ((self.encode_table[byte_values >> 4].astype(np.uint64) << np.uint64(7))
+                                  | self.encode_table[byte_values & 0x0F])
+        pair_values = np.arange(1 << 14)
+        self.pair_decode_table = ((self.decode_table[pair_values >> 7] << 4)
+                                  | self.decode_table[pair_values & 0x7F]).astype(np.uint8)
+        self.pair_error_table = self.error_table[pair_values >> 7] + self.error_table[pair_values & 0x7F]
+
     def encode(self, data):
         # data should be a vector of 4 bits
         codeword = np.dot(self.G, data) % 2
@@ -40,6 +63,196 @@ class Hamming74:
         # Extract original 4 data bits from indices 2, 4, 5, 6 (1-indexed: 3, 5, 6, 7)
         return corrected[[2, 4, 5, 6]]
 
+    def encode_bytes(self, data, chunk_size=1 << 16):
+        """
+        Encode a bytes-like buffer, one codeword per nibble (high nibble first).
+        Codewords are packed back to back: every 4 input bytes become 7 output
+        bytes, and a trailing partial group is zero-padded to a whole byte.
+        """
+        data = np.frombuffer(data, dtype=np.uint8)
+        n = len(data)
+        out = np.empty((-(-n // 4), 8), dtype=np.uint8)
+        step = chunk_size // 4 * 4 or 4
+        for start in range(0, n, step):
+            chunk = data[start:start + step]
+            groups = out[start // 4:(start + len(chunk) + 3) // 4]
+            if len(chunk) % 4:
+                chunk = np.concatenate([chunk, np.zeros(4 - len(chunk) % 4, dtype=np.uint8)])
+            chunk = chunk.reshape(-1, 4)
+            # Four 14-bit byte codes fill the low 56 bits of a big-endian uint64
+            words = self.byte_encode_table[chunk[:, 0]] << np.uint64(42)
+            words |= self.byte_encode_table[chunk[:, 1]] << np.uint64(28)
+            words |= self.byte_encode_table[chunk[:, 2]] << np.uint64(14)
+            words |= self.byte_encode_table[chunk[:, 3]]
+            groups[:] = words.astype(">u8").view(np.uint8).reshape(-1, 8)
+        return out[:, 1:].tobytes()[:(14 * n + 7) // 8]
+
+    def decode_bytes(self, data, chunk_size=1 << 16):
+        """
+        Decode a buffer produced by encode_bytes, correcting single-bit errors.
+        Returns (decoded bytes, number of corrected codewords).
+        """
+        data = np.frombuffer(data, dtype=np.uint8)
+        full, rest = divmod(len(data), 7)
+        if rest % 2:
+            raise ValueError("Buffer length is not a valid Hamming(7,4) stream length.")
+        n = 4 * full + rest // 2
+
+        out = np.empty(-(-n // 4) * 4, dtype=np.uint8)
+        n_errors = 0
+        step = chunk_size // 7 * 7 or 7
+        for start in range(0, len(data), step):
+            chunk = data[start:start + step]
+            if len(chunk) % 7:
+                chunk = np.concatenate([chunk, np.zeros(7 - len(chunk) % 7, dtype=np.uint8)])
+            b = chunk.reshape(-1, 7).astype(np.uint16).T
+
+            # Split each 7-byte group back into four 14-bit byte codes
+            pairs = np.empty((len(b[0]), 4), dtype=np.uint16)
+            pairs[:, 0] = (b[0] << 6) | (b[1] >> 2)
+            pairs[:, 1] = ((b[1] & 0x03) << 12) | (b[2] << 4) | (b[3] >> 4)
+            pairs[:, 2] = ((b[3] & 0x0F) << 10) | (b[4] << 2) | (b[5] >> 6)
+            pairs[:, 3] = ((b[5] & 0x3F) << 8) | b[6]
+            first = start // 7 * 4
+            out[first:first + pairs.size] = self.pair_decode_table[pairs.ravel()]
+            # Codewords past n in the last group are zero padding, not data
+            used = pairs.ravel()[:n - first]
+            n_errors += int(self.pair_error_table[used].sum())
+        return out[:n].tobytes(), n_errors
+
+class HammingCode:
+    """
+    General Hamming(2^r - 1, 2^r - r - 1) code, or the extended SECDED code
+    (one extra overall parity bit, stored first) when extended=True.
+    Works on (N, k) data / (N, n) codeword bit matrices; the mod-2 products are
+    exact float32 matrix multiplies, since NumPy integer matmul has no BLAS path.
+    The code is systematic, so only the parity rows of the generator are stored
+    (parity_matrix, O(r * k) instead of O(n * k)).
+    """
+    def __init__(self, r, extended=False):
+        if r < 2:
+            raise ValueError("r must be at least 2.")
+        self.r = r
+        self.extended = extended
+        n = 2 ** r - 1
+        k = n - r
+
+        # Column j of H is the binary representation of position j + 1
+        positions = np.arange(1, n + 1)
+        H = (positions[None, :] >> np.arange(r)[:, None]) & 1
+        parity_cols = (1 << np.arange(r)) - 1
+        data_cols = np.setdiff1d(np.arange(n), parity_cols)
+
+        # Parity bit i covers the data positions with bit i set; data bits are copied
+        parity_matrix = H[:, data_cols]
+
+        # Syndrome value -> column index of the flipped bit (-1 means no error)
+        self.syndrome_table = np.concatenate([[-1], positions - 1])
+
+        if extended:
+            # Overall parity bit in column 0 makes every codeword even weight: data bit j
+            # enters it once directly and once per parity bit covering it
+            overall = (1 + parity_matrix.sum(axis=0, keepdims=True)) % 2
+            parity_matrix = np.vstack([overall, parity_matrix])
+            H = np.vstack([np.ones((1, n + 1), dtype=H.dtype),
+                           np.hstack([np.zeros((r, 1), dtype=H.dtype), H])])
+            parity_cols = np.concatenate([[0], parity_cols + 1])
+            data_cols = data_cols + 1
+            n += 1
+
+        self.n, self.k = n, k
+        self.parity_matrix = parity_matrix.astype(np.uint8)
+        self.H = H.astype(np.uint8)
+        self.data_cols = data_cols
+        self.parity_cols = parity_cols
+        self._P_T = self.parity_matrix.T.astype(np.float32)
+        # Data columns form runs between the parity positions; copy them as slices
+        breaks = np.flatnonzero(np.diff(data_cols) > 1) + 1
+        self._data_runs = [(slice(run[0], run[-1] + 1), slice(first, first + len(run)))
+                           for run, first in zip(np.split(data_cols, breaks), np.r_[0, breaks])]
+        self._H_T = self.H.T.astype(np.float32)
+        self._syndrome_weights = (1 << np.arange(r)).astype(np.float32)
+
+    def _mod2_matmul(self, bits, matrix_T):
+        # Dot products reach 2^(r-1); cast through int32, since float -> uint8 is undefined past 255
+        return ((bits.astype(np.float32) @ matrix_T).astype(np.int32) & 1).astype(np.uint8)
+
+    def encode(self, data, chunk_size=1 << 16):
+        """Encode an (N, k) bit matrix (or a single k-vector) into (N, n) codewords."""
+        data = np.asarray(data, dtype=np.uint8)
+        single = data.ndim == 1
+        data = np.atleast_2d(data)
+        codewords = np.empty((len(data), self.n), dtype=np.uint8)
+        for start in range(0, len(data), chunk_size):
+            stop = start + chunk_size
+            block, out = data[start:stop], codewords[start:stop]
+            for code_run, data_run in self._data_runs:
+                out[:, code_run] = block[:, data_run]
+            for i, bits in zip(self.parity_cols, self._mod2_matmul(block, self._P_T).T):
+                out[:, i] = bits
+        return codewords[0] if single else codewords
+
+    def decode(self, received, chunk_size=1 << 16):
+        """
+        Decode an (N, n) bit matrix (or a single n-vector).
+        Returns (data, status) where status is 0 = no error, 1 = corrected,
+        2 = double error detected but not corrected (extended code only).
+        """
+        received = np.asarray(received, dtype=np.uint8)
+        single = received.ndim == 1
+        received = np.atleast_2d(received)
+        data = np.empty((len(received), self.k), dtype=np.uint8)
+        status = np.zeros(len(received), dtype=np.uint8)
+        for start in range(0, len(received), chunk_size):
+            stop = start + chunk_size
+            data[start:stop], status[start:stop] = self._decode_chunk(received[start:stop])
+        if single:
+            return data[0], status[0]
+        return data, status
+
+    def _decode_chunk(self, received):
+        syndrome = self._mod2_matmul(received, self._H_T)
+        if self.extended:
+            overall_parity, syndrome = syndrome[:, 0], syndrome[:, 1:]
+        syndrome_val = (syndrome @ self._syndrome_weights).astype(np.intp)
+        error_col = self.syndrome_table[syndrome_val]
+
+        if self.extended:
+            # Odd overall parity: single error (in column 0 if the Hamming syndrome is zero)
+            fix = overall_parity == 1
+            error_col = np.where(syndrome_val > 0, error_col + 1, 0)
+            status = np.where(fix, 1, np.where(syndrome_val > 0, 2, 0)).astype(np.uint8)
+        else:
+            fix = error_col >= 0
+            status = fix.astype(np.uint8)
+
+        corrected = received.copy()
+        rows = np.flatnonzero(fix)
+        corrected[rows, error_col[rows]] ^= 1
+        return corrected[:, self.data_cols], status
+
+    def encode_packed(self, packed_data, chunk_size=1 << 16):
+        """Like encode, but rows are np.packbits-packed uint8 on input and output."""
+        packed_data = np.atleast_2d(np.asarray(packed_data, dtype=np.uint8))
+        out = np.empty((len(packed_data), -(-self.n // 8)), dtype=np.uint8)
+        for start in range(0, len(packed_data), chunk_size):
+            stop = start + chunk_size
+            data = np.unpackbits(packed_data[start:stop], axis=1, count=self.k)
+            out[start:stop] = np.packbits(self.encode(data, chunk_size), axis=1)
+        return out
+
+    def decode_packed(self, packed_received, chunk_size=1 << 16):
+        """Like decode, but rows are np.packbits-packed uint8 on input and output."""
+        packed_received = np.atleast_2d(np.asarray(packed_received, dtype=np.uint8))
+        out = np.empty((len(packed_received), -(-self.k // 8)), dtype=np.uint8)
+        status = np.empty(len(packed_received), dtype=np.uint8)
+        for start in range(0, len(packed_received), chunk_size):
+            stop = start + chunk_size
+            received = np.unpackbits(packed_received[start:stop], axis=1, count=self.n)
+            data, status[start:stop] = self.decode(received, chunk_size)
+            out[start:stop] = np.packbits(data, axis=1)
+        return out, status
+
 if __name__ == "__main__":
     hamming = Hamming74()
     
@@ -64,3 +277,26 @@ if __name__ == "__main__":
     
     if np.array_equal(data, decoded):
         print("\nSuccess: Data recovered correctly!")
+
+    # Byte-stream codec
+    message = b"Hamming codes protect data!"
+    encoded_stream = bytearray(hamming.encode_bytes(message))
+    print(f"\nEncoded {len(message)} bytes into {len(encoded_stream)} bytes")
+    for byte_idx in (0, 9, 20):
+        encoded_stream[byte_idx] ^= 0x04 # One flipped bit in three different codewords
+    decoded_stream, n_errors = hamming.decode_bytes(memoryview(encoded_stream))
+    print(f"Decoded: {decoded_stream} ({n_errors} codewords corrected)")
+
+    # General Hamming codes on a batch of blocks
+    for code in (HammingCode(6), HammingCode(6, extended=True)):
+        rng = np.random.default_rng(0)
+        blocks = rng.integers(0, 2, size=(100000, code.k), dtype=np.uint8)
+        codewords = code.encode(blocks)
+        flips = rng.integers(0, code.n, size=(len(blocks), 2))
+        codewords[np.arange(len(blocks)), flips[:, 0]] ^= 1 # One error in every block
+        codewords[np.arange(10), (flips[:10, 0] + 1) % code.n] ^= 1 # Two errors in the first ten
+        decoded, status = code.decode(codewords)
+        name = f"({code.n},{code.k}){' SECDED' if code.extended else ''}"
+        print(f"\nHamming{name}: {np.count_nonzero(status == 1)} corrected, "
+              f"{np.count_nonzero(status == 2)} detected, "
+              f"{np.count_nonzero((decoded != blocks).any(axis=1))} blocks wrong")
@@ -11,29 +11,183 @@ def coin_flip_log_probability(n=10000, p=0.5):
     return n * math.log2(p)
 
 # 3. Information Theory Metrics
-def entropy(p):
-    p = np.array(p)
-    return -np.sum(p * np.log2(p + 1e-12))
+# All metrics reduce over `axis`, so a (batch, K) array gives one value per row.
+# `kind` says how the distribution is given: "probs", "logits" (normalized with
+# log-sum-exp) or "log_probs". Zero probabilities are handled exactly
+# (0 * log 0 = 0, p > 0 with q = 0 gives inf) instead of adding an epsilon.
+# float32 inputs stay float32 unless `dtype` says otherwise; `out` receives the result.
+_LN2 = math.log(2)
 
-def cross_entropy(p, q):
-    p, q = np.array(p), np.array(q)
-    return -np.sum(p * np.log2(q + 1e-12))
+def _as_float(x, dtype):
+    x = np.asarray(x)
+    return x.astype(dtype or np.result_type(x.dtype, np.float32), copy=False)
 
-def kl_divergence(p, q):
-    p, q = np.array(p), np.array(q)
-    return np.sum(p * np.log2((p + 1e-12) / (q + 1e-12)))
+def logsumexp(x, axis=-1):
+    x = np.asarray(x)
+    m = np.max(x, axis=axis, keepdims=True)
+    m[~np.isfinite(m)] = 0
+    total = np.sum(np.exp(x - m), axis=axis, keepdims=True)
+    return np.log(total) + m
+
+def _log_probs(x, kind, axis, dtype):
+    """Natural-log probabilities as a fresh array that callers may overwrite."""
+    x = _as_float(x, dtype)
+    if kind == "probs":
+        with np.errstate(divide="ignore"):
+            return np.log(x)
+    if kind == "logits":
+        return x - logsumexp(x, axis)
+    if kind == "log_probs":
+        return x.copy()
+    raise ValueError("kind must be 'probs', 'logits' or 'log_probs'.")
+
+def _reduce_bits(terms, axis, out, sign):
+    # Sum natural-log terms along axis and convert to bits in place
+    total = np.sum(terms, axis=axis, out=out)
+    return np.multiply(total, sign / _LN2, out=out)
+
+def entropy(p, axis=-1, kind="probs", dtype=None, out=None):
+    log_p = _log_probs(p, kind, axis, dtype)
+    p = _as_float(p, log_p.dtype) if kind == "probs" else np.exp(log_p)
+    np.copyto(log_p, 0, where=p == 0)
+    return _reduce_bits(np.multiply(p, log_p, out=log_p), axis, out, -1)
+
+def cross_entropy(p, q, axis=-1, kind="probs", dtype=None, out=None):
+    log_q = _log_probs(q, kind, axis, dtype)
+    p = _as_float(p, log_q.dtype)
+    np.copyto(log_q, 0, where=p == 0)
+    return _reduce_bits(np.multiply(p, log_q, out=log_q), axis, out, -1)
+
+def kl_divergence(p, q, axis=-1, kind="probs", dtype=None, out=None):
+    log_q = _log_probs(q, kind, axis, dtype)
+    p = _as_float(p, log_q.dtype)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = np.subtract(np.log(p), log_q, out=log_q)
+    np.copyto(terms, 0, where=p == 0)
+    return _reduce_bits(np.multiply(p, terms, out=terms), axis, out, 1)
 
 def mutual_information(p_xy):
-    p_xy = np.array(p_xy)
-    p_x = np.sum(p_xy, axis=1)
-    p_y = np.sum(p_xy, axis=0)
-    
-    mi = 0
-    for i in range(len(p_x)):
-        for j in range(len(p_y)):
-            if p_xy[i, j] > 0:
-                mi += p_xy[i, j] * math.log2(p_xy[i, j] / (p_x[i] * p_y[j]))
-    return mi
+    p_xy = np.array(p_xy, dtype=float)
+    p_x = np.sum(p_xy, axis=1, keepdims=True)
+    p_y = np.sum(p_xy, axis=0, keepdims=True)
+
+    nz = p_xy > 0
+    ratio = p_xy[nz] / (p_x * p_y)[nz]
+    return float(np.sum(p_xy[nz] * np.log2(ratio)))
+
+# 4. Streaming estimators from raw samples
+# Counts are kept as sorted key / count arrays, so memory grows with the number
+# of distinct symbols (or symbol pairs), never with the number of samples.
+def count_entropy(counts, method="plugin"):
+    """
+    Entropy in bits of the empirical distribution given by an array of counts.
+    method="miller-madow" adds the (m - 1) / (2N) bias correction (m = occupied bins).
+    """
+    counts = np.asarray(counts, dtype=float)
+    counts = counts[counts > 0]
+    total = counts.sum()
+    if total == 0:
+        return 0.0
+    h = np.log2(total) - np.dot(counts, np.log2(counts)) / total
+    if method == "miller-madow":
+        h += (len(counts) - 1) / (2 * total * math.log(2))
+    elif method != "plugin":
+        raise ValueError("method must be 'plugin' or 'miller-madow'.")
+    return float(h)
+
+class _SymbolTable:
+    """
+    Maps hashable symbols to dense integer ids. A chunk is a 1-D sequence of
+    symbols (tuples and mixed types are single symbols). Numeric and string
+    NumPy arrays take a vectorized path with one dict lookup per distinct symbol;
+    anything else is looked up sample by sample so symbols are never flattened
+    or coerced to a common type.
+    """
+    def __init__(self):
+        self.ids = {}
+
+    def encode(self, samples):
+        if isinstance(samples, np.ndarray):
+            if samples.ndim != 1:
+                raise ValueError("Samples must be a 1-D sequence of symbols.")
+            fast = samples.dtype.kind in "biufUS"
+        else:
+            samples = list(samples)
+            # Only homogeneous numbers stay exact under np.asarray (mixed types become strings)
+            fast = all(isinstance(v, (int, float, np.integer, np.floating)) for v in samples)
+        if not fast:
+            return np.fromiter((self.ids.setdefault(v, len(self.ids)) for v in samples),
+                               dtype=np.int64, count=len(samples))
+
+        uniques, inverse = np.unique(np.asarray(samples), return_inverse=True)
+        local_ids = np.array([self.ids.setdefault(u.item(), len(self.ids)) for u in uniques], dtype=np.int64)
+        return local_ids[inverse]
+
+class _SparseCounter:
+    """Counts of int64 keys stored as a sorted unique-key array and a matching count array."""
+    def __init__(self):
+        self.keys = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+
+    def update(self, keys):
+        new_keys, new_counts = np.unique(keys, return_counts=True)
+        merged, inverse = np.unique(np.concatenate([self.keys, new_keys]), return_inverse=True)
+        self.counts = np.bincount(inverse, weights=np.concatenate([self.counts, new_counts]),
+                                  minlength=len(merged)).astype(np.int64)
+        self.keys = merged
+
+class StreamingEntropy:
+    """Incremental entropy estimate of a stream of categorical samples."""
+    def __init__(self):
+        self._symbols = _SymbolTable()
+        self._counter = _SparseCounter()
+        self.n_samples = 0
+
+    def update(self, samples):
+        ids = self._symbols.encode(samples)
+        self._counter.update(ids)
+        self.n_samples += len(ids)
+        return self
+
+    @property
+    def n_symbols(self):
+        return len(self._counter.keys)
+
+    def entropy(self, method="plugin"):
+        return count_entropy(self._counter.counts, method)
+
+class StreamingMutualInformation:
+    """Incremental mutual information estimate of a stream of (x, y) sample pairs."""
+    def __init__(self):
+        self._x = StreamingEntropy()
+        self._y = StreamingEntropy()
+        self._joint = _SparseCounter()
+        self.n_samples = 0
+
+    def update(self, xs, ys):
+        x_ids = self._x._symbols.encode(xs)
+        y_ids = self._y._symbols.encode(ys)
+        if len(x_ids) != len(y_ids):
+            raise ValueError("xs and ys must contain the same number of samples.")
+        self._x._counter.update(x_ids)
+        self._y._counter.update(y_ids)
+        # Pack the id pair into one int64 key (ids are dense, so 32 bits each is plenty)
+        self._joint.update((x_ids << 32) | y_ids)
+        self.n_samples += len(x_ids)
+        return self
+
+    def entropy_x(self, method="plugin"):
+        return self._x.entropy(method)
+
+    def entropy_y(self, method="plugin"):
+        return self._y.entropy(method)
+
+    def joint_entropy(self, method="plugin"):
+        return count_entropy(self._joint.counts, method)
+
+    def mutual_information(self, method="plugin"):
+        # I(X;Y) = H(X) + H(Y) - H(X,Y), each term estimated with the same method
+        return self.entropy_x(method) + self.entropy_y(method) - self.joint_entropy(method)
 
 if __name__ == "__main__":
     n = 10000
@@ -70,3 +224,22 @@ if __name__ == "__main__":
     p_xy = [[0.5, 0.0], [0.0, 0.5]]
     mi = mutual_information(p_xy)
     print(f"\n5. Mutual Information (Perfectly correlated coins): {mi:.2f} bits")
+
+    # Batched metrics: one value per row from a single call, straight from logits
+    rng = np.random.default_rng(0)
+    logits = rng.normal(size=(1000000, 10)).astype(np.float32)
+    targets = np.eye(10, dtype=np.float32)[rng.integers(0, 10, size=len(logits))]
+    scores = np.empty(len(logits), dtype=np.float32)
+    cross_entropy(targets, logits, kind="logits", out=scores)
+    print(f"\n6. Mean cross-entropy of {len(logits)} predictions from logits: {scores.mean():.4f} bits")
+
+    # Streaming estimate from raw samples: Y is a noisy copy of X
+    stream = StreamingMutualInformation()
+    for _ in range(10):
+        xs = rng.integers(0, 8, size=100000)
+        ys = np.where(rng.random(len(xs)) < 0.9, xs, rng.integers(0, 8, size=len(xs)))
+        stream.update(xs, ys)
+    print(f"\n7. Streaming estimates from {stream.n_samples} samples:")
+    print(f"   H(X): {stream.entropy_x():.4f} bits (Miller-Madow: {stream.entropy_x('miller-madow'):.4f})")
+    print(f"   I(X;Y): {stream.mutual_information():.4f} bits "
+          f"(Miller-Madow: {stream.mutual_information('miller-madow'):.4f})")
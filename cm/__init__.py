@@ -0,0 +1,59 @@
+"""
+Importable view of the course modules.
+
+The assignments live in per-week folders as standalone scripts, some with names
+that are not valid module names ("Week 10", "Companion-MatrixMethod.py"). This
+package maps each script to a submodule, e.g. ``cm.hamming_code`` or
+``cm.linear_algebra``. Nothing is imported up front: ``import cm`` only installs
+a path finder, and a submodule (with its NumPy import) is loaded on first use,
+either by ``import cm.<name>`` or attribute access such as ``cm.solve_ode``.
+"""
+import importlib
+import os
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Submodule name -> source file, relative to the repository root
+_SUBMODULES = {
+    "hw1": "hw1.py",
+    "hw2": "hw2.py",
+    "hw3": "hw3.py",
+    "companion_matrix": os.path.join("Homework4", "Companion-MatrixMethod.py"),
+    "weierstrass": os.path.join("Homework4", "WeierstrassMethod.py"),
+    "geometry": os.path.join("Homework5", "geometry.py"),
+    "neural_network": os.path.join("MidTerm", "neural_network.py"),
+    "parallel_training": os.path.join("MidTerm", "parallel_training.py"),
+    "statistics_tests": os.path.join("Week8", "statistics_tests.py"),
+    "resampling_tests": os.path.join("Week8", "resampling_tests.py"),
+    "information_theory": os.path.join("Week9", "information_theory.py"),
+    "hamming_code": os.path.join("Week9", "hamming_code.py"),
+    "ber_simulation": os.path.join("Week9", "ber_simulation.py"),
+    "linear_algebra": os.path.join("Week 10", "linear_algebra.py"),
+    "fourier_transform": os.path.join("Week11", "fourier_transform.py"),
+    "solve_ode": os.path.join("Homework13", "solve_ode.py"),
+    "ode_ensemble": os.path.join("Homework13", "ode_ensemble.py"),
+}
+
+__all__ = sorted(_SUBMODULES)
+
+class _SourceFinder:
+    """Meta path finder resolving ``cm.<name>`` to its script in the repository."""
+    @classmethod
+    def find_spec(cls, fullname, path=None, target=None):
+        package, _, name = fullname.rpartition(".")
+        if package != __name__ or name not in _SUBMODULES:
+            return None
+        import importlib.util # deferred: only needed once a submodule is actually loaded
+        return importlib.util.spec_from_file_location(fullname, os.path.join(_ROOT, _SUBMODULES[name]))
+
+if _SourceFinder not in sys.meta_path:
+    sys.meta_path.append(_SourceFinder)
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -20,7 +20,8 @@ def theorem1(f, x):
 def f(x):
     return x**3
 
-print('df(f, 2)=', df(f, 2))
-print('integral(f, 0, 2)=', integral(f, 0, 2))
+if __name__ == "__main__":
+    print('df(f, 2)=', df(f, 2))
+    print('integral(f, 0, 2)=', integral(f, 0, 2))
 
-theorem1(f, 2)
\ No newline at end of file
+    theorem1(f, 2)